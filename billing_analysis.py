@@ -6,48 +6,178 @@ Author: David Madison
 Data Period: January - March 2025
 """
 
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from pathlib import Path
 
-# Set professional styling
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['axes.labelsize'] = 11
+CACHE_DIR = Path('.cache')
+# Bump when the stored sheet layout or dtypes change, to invalidate old caches
+_CACHE_FORMAT = 2
+
+# Pie charts above this many slices switch to horizontal bars
+MAX_PIE_SLICES = 6
+
+# Columns the analysis reads from each sheet; sheets not listed load in full
+_SHEET_COLS = {
+    'Client Breakdown': ['Customer', 'Calls', 'Revenue', 'Cost', 'GM%'],
+    'Country Breakdown': ['Country', 'Revenue', 'GM%'],
+    'Carrier Breakdown': ['Number Type', 'Revenue', 'Cost', 'GM%'],
+    'Vendor Costs': ['Vendor', 'Total Cost'],
+    'Low Margin Clients': ['Customer', 'Revenue', 'GM%'],
+    'Low Margin Countries': ['Country', 'Revenue', 'GM%'],
+}
+
+# Report banners, built once
+_BANNER = "=" * 60
+_HEAVY = "█" * 60
+_HEAVY_SPACER = "██" + " " * 56 + "██"
+_TITLE_LINE = "██" + "  AVOXI BILLING ANALYSIS - COMPREHENSIVE REPORT  ".center(56) + "██"
+_RECOMMENDATIONS = f"""
+{_BANNER}
+KEY RECOMMENDATIONS
+{_BANNER}
+
+1. ✓ Implement pricing increase: Mobile +7%, Landline +20%
+   → Achieves 46.37% margin (exceeds 45% target)
+
+2. ✓ Optimize routing for short-duration calls
+   → Route to per-second vendors (Vendor 2) when possible
+
+3. ✓ Review pricing for low-margin segments:
+   → Countries: United States, Chile, Australia
+   → Clients: Review those below 35% margin threshold
+
+4. ✓ Monitor vendor concentration
+   → Top 2 vendors account for ~74% of costs
+   → Consider diversification strategy
+
+{_BANNER}
+Analysis completed successfully!
+{_BANNER}
+
+"""
+
+
+def _print_lines(lines):
+    """Print a Series of preformatted report lines in a single call"""
+    if len(lines):
+        print("\n".join(lines))
+
 
 class AVOXIBillingAnalyzer:
     """Analyze telecommunications billing data and generate insights"""
     
-    def __init__(self, filepath):
+    # Bound column formatters for the console tables
+    _FMT_REV = "{:>10,.2f}".format
+    _FMT_REV_SHORT = "{:>8,.2f}".format
+    _FMT_PCT = "{:>6.1%}".format
+    _FMT_SHARE = "{:>5.1f}%".format
+    _FMT_CALLS = "{:>6}".format
+    
+    def __init__(self, filepath, no_cache=False):
         """Initialize analyzer with Excel file"""
         self.filepath = filepath
+        self.no_cache = no_cache
         self.data = {}
         self.load_data()
         
     def load_data(self):
-        """Load all sheets from Excel file"""
-        xl = pd.ExcelFile(self.filepath)
-        for sheet in xl.sheet_names:
-            self.data[sheet] = pd.read_excel(xl, sheet_name=sheet)
-        print(f"✓ Loaded {len(self.data)} sheets successfully")
+        """Load all sheets from Excel file, reusing the parquet cache when valid"""
+        # Hashing the workbook is the cache's main cost, so skip it when disabled
+        cache_dir = None if self.no_cache else self._cache_path()
+        if cache_dir is not None and cache_dir.is_dir():
+            for path in sorted(cache_dir.glob('*.parquet')):
+                sheet = path.stem.split('__', 1)[1]
+                self.data[sheet] = pd.read_parquet(path)
+            print(f"✓ Loaded {len(self.data)} sheets from cache")
+        else:
+            self._read_workbook()
+            if cache_dir is not None:
+                self._write_cache(cache_dir)
+            print(f"✓ Loaded {len(self.data)} sheets successfully")
+        
+        # Metric -> value lookup shared by the report and the charts
+        summary = self.data['Summary']
+        self._summary = dict(zip(summary['Metric'], summary['Value']))
+        
+        # Sorted once, reused by the console report and the charts
+        self._top_clients = self.data['Client Breakdown'].sort_values('Revenue', ascending=False)
+        self._top_countries = self.data['Country Breakdown'].sort_values('Revenue', ascending=False)
+    
+    def _cache_path(self):
+        """Cache directory keyed on workbook filename, content and column selection"""
+        path = Path(self.filepath)
+        key = hashlib.blake2b(path.read_bytes(), digest_size=16)
+        key.update(repr((_CACHE_FORMAT, _SHEET_COLS)).encode())
+        return CACHE_DIR / f"avoxi_{path.stem}_{key.hexdigest()}"
+    
+    def _read_workbook(self):
+        """Parse every sheet of the Excel file into self.data"""
+        try:
+            # Rust-based reader, roughly twice as fast as openpyxl
+            xl = pd.ExcelFile(self.filepath, engine='calamine')
+        except (ImportError, ValueError):
+            # python-calamine missing (or pandas < 2.2): pandas opens openpyxl
+            # workbooks in streaming read-only mode
+            xl = pd.ExcelFile(self.filepath, engine='openpyxl')
+        # One open workbook serves every sheet; usecols differs per sheet, so
+        # sheets are read individually rather than with sheet_name=None
+        with xl:
+            for sheet in xl.sheet_names:
+                self.data[sheet] = pd.read_excel(xl, sheet_name=sheet,
+                                                 usecols=_SHEET_COLS.get(sheet))
+        
+        # Labels that repeat across rows (countries, carrier types) compare and
+        # sort on categorical codes; mostly-unique text such as client names or
+        # notes gains nothing and keeps its string dtype
+        for df in self.data.values():
+            for col in df.columns:
+                if (pd.api.types.is_string_dtype(df[col].dtype)
+                        and df[col].nunique() < len(df) // 2):
+                    df[col] = df[col].astype('category')
+    
+    def _write_cache(self, cache_dir):
+        """Store parsed sheets as parquet; caching is best-effort"""
+        tmp_dir = cache_dir.with_name(cache_dir.name + '.tmp')
+        try:
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            # Index prefix preserves workbook sheet order on reload
+            for i, (sheet, df) in enumerate(self.data.items()):
+                df.to_parquet(tmp_dir / f"{i:02d}__{sheet}.parquet", index=False)
+            tmp_dir.rename(cache_dir)
+        except Exception as exc:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            print(f"⚠ Skipping sheet cache: {exc}")
+    
+    def _export_results(self, results):
+        """Persist the last run's numbers so consumers need not re-run the pipeline"""
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            with open(CACHE_DIR / 'last_run.json', 'w', encoding='utf-8') as f:
+                # numpy scalars (e.g. int64 call counts) are not JSON-native
+                json.dump(results, f, indent=2, default=lambda value: value.item())
+            self._top_clients.to_parquet(CACHE_DIR / 'top_clients.parquet', index=False)
+        except Exception as exc:
+            print(f"⚠ Skipping results export: {exc}")
     
     def generate_summary_report(self):
         """Generate executive summary statistics"""
-        print("\n" + "="*60)
+        print("\n" + _BANNER)
         print("EXECUTIVE SUMMARY")
-        print("="*60)
+        print(_BANNER)
         
-        summary = self.data['Summary']
-        total_revenue = summary.loc[summary['Metric'] == 'Total Revenue', 'Value'].values[0]
-        total_cost = summary.loc[summary['Metric'] == 'Total Cost', 'Value'].values[0]
-        current_margin = summary.loc[summary['Metric'] == 'Gross Margin % (Current)', 'Value'].values[0]
-        projected_revenue = summary.loc[summary['Metric'] == 'Total Revenue (After Increase)', 'Value'].values[0]
-        projected_margin = summary.loc[summary['Metric'] == 'Gross Margin % (After Increase)', 'Value'].values[0]
+        total_revenue = self._summary['Total Revenue']
+        total_cost = self._summary['Total Cost']
+        current_margin = self._summary['Gross Margin % (Current)']
+        projected_revenue = self._summary['Total Revenue (After Increase)']
+        projected_margin = self._summary['Gross Margin % (After Increase)']
         
         print(f"\nCurrent Performance:")
         print(f"  Revenue:       ${total_revenue:,.2f}")
@@ -67,17 +197,16 @@ class AVOXIBillingAnalyzer:
     
     def analyze_top_clients(self, n=10):
         """Analyze top clients by revenue and margin"""
-        clients = self.data['Client Breakdown'].copy()
-        clients = clients.sort_values('Revenue', ascending=False)
-        
-        print(f"\n{'='*60}")
+        print(f"\n{_BANNER}")
         print(f"TOP {n} CLIENTS BY REVENUE")
-        print("="*60)
+        print(_BANNER)
         
-        top_clients = clients.head(n)
-        for idx, row in top_clients.iterrows():
-            print(f"{row['Customer']:12} | Rev: ${row['Revenue']:>10,.2f} | "
-                  f"Margin: {row['GM%']:>6.1%} | Calls: {row['Calls']:>6}")
+        top_clients = self._top_clients.head(n)
+        lines = (top_clients['Customer'].astype(str).str.ljust(12)
+                 + ' | Rev: $' + top_clients['Revenue'].map(self._FMT_REV)
+                 + ' | Margin: ' + top_clients['GM%'].map(self._FMT_PCT)
+                 + ' | Calls: ' + top_clients['Calls'].map(self._FMT_CALLS))
+        _print_lines(lines)
         
         return top_clients
     
@@ -86,14 +215,15 @@ class AVOXIBillingAnalyzer:
         vendors = self.data['Vendor Costs']
         total_cost = vendors['Total Cost'].sum()
         
-        print(f"\n{'='*60}")
+        print(f"\n{_BANNER}")
         print("VENDOR COST ANALYSIS")
-        print("="*60)
+        print(_BANNER)
         
-        for idx, row in vendors.iterrows():
-            pct = (row['Total Cost'] / total_cost) * 100
-            print(f"{row['Vendor']:12} | Cost: ${row['Total Cost']:>10,.2f} | "
-                  f"Share: {pct:>5.1f}%")
+        shares = vendors['Total Cost'].to_numpy() / total_cost * 100
+        lines = (vendors['Vendor'].astype(str).str.ljust(12)
+                 + ' | Cost: $' + vendors['Total Cost'].map(self._FMT_REV)
+                 + ' | Share: ' + list(map(self._FMT_SHARE, shares)))
+        _print_lines(lines)
         
         return vendors
     
@@ -102,21 +232,25 @@ class AVOXIBillingAnalyzer:
         low_margin_clients = self.data['Low Margin Clients']
         low_margin_countries = self.data['Low Margin Countries']
         
-        print(f"\n{'='*60}")
+        print(f"\n{_BANNER}")
         print("OPTIMIZATION OPPORTUNITIES")
-        print("="*60)
+        print(_BANNER)
         
         print("\nLow Margin Clients (< 35%):")
-        for idx, row in low_margin_clients.iterrows():
-            if row['GM%'] < 0.35:
-                print(f"  {row['Customer']:12} | Margin: {row['GM%']:>6.1%} | "
-                      f"Revenue: ${row['Revenue']:>8,.2f}")
+        mask = low_margin_clients['GM%'].to_numpy() < 0.35
+        clients = low_margin_clients.loc[mask, ['Customer', 'GM%', 'Revenue']]
+        lines = ('  ' + clients['Customer'].astype(str).str.ljust(12)
+                 + ' | Margin: ' + clients['GM%'].map(self._FMT_PCT)
+                 + ' | Revenue: $' + clients['Revenue'].map(self._FMT_REV_SHORT))
+        _print_lines(lines)
         
         print("\nLow Margin Countries (< 35%):")
-        for idx, row in low_margin_countries.iterrows():
-            if row['GM%'] < 0.35:
-                print(f"  {row['Country']:15} | Margin: {row['GM%']:>6.1%} | "
-                      f"Revenue: ${row['Revenue']:>10,.2f}")
+        mask = low_margin_countries['GM%'].to_numpy() < 0.35
+        countries = low_margin_countries.loc[mask, ['Country', 'GM%', 'Revenue']]
+        lines = ('  ' + countries['Country'].astype(str).str.ljust(15)
+                 + ' | Margin: ' + countries['GM%'].map(self._FMT_PCT)
+                 + ' | Revenue: $' + countries['Revenue'].map(self._FMT_REV))
+        _print_lines(lines)
         
         return low_margin_clients, low_margin_countries
     
@@ -124,100 +258,199 @@ class AVOXIBillingAnalyzer:
         """Generate professional visualizations"""
         Path(output_dir).mkdir(exist_ok=True)
         
-        # 1. Revenue vs Margin Comparison
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-        
-        summary = self.data['Summary']
-        current_margin = summary.loc[summary['Metric'] == 'Gross Margin % (Current)', 'Value'].values[0]
-        projected_margin = summary.loc[summary['Metric'] == 'Gross Margin % (After Increase)', 'Value'].values[0]
-        
-        scenarios = ['Current', 'After Price\nIncrease']
-        margins = [current_margin * 100, projected_margin * 100]
-        colors = ['#FF6B6B', '#4ECDC4']
-        
-        bars = axes[0].bar(scenarios, margins, color=colors, alpha=0.8, edgecolor='black')
-        axes[0].axhline(y=45, color='green', linestyle='--', linewidth=2, label='Target: 45%')
-        axes[0].set_ylabel('Gross Margin (%)', fontweight='bold')
-        axes[0].set_title('Gross Margin: Current vs Projected', fontweight='bold', pad=20)
-        axes[0].legend()
-        axes[0].set_ylim(0, 50)
-        
-        for bar in bars:
-            height = bar.get_height()
-            axes[0].text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.1f}%',
-                        ha='center', va='bottom', fontweight='bold', fontsize=12)
-        
-        # 2. Top 10 Clients by Revenue
-        clients = self.data['Client Breakdown'].sort_values('Revenue', ascending=False).head(10)
-        
-        y_pos = np.arange(len(clients))
-        colors_clients = plt.cm.viridis(np.linspace(0.3, 0.9, len(clients)))
+        # Charts are independent, so they can render in parallel worker processes
+        tasks = [
+            (_plot_revenue_margin, (f'{output_dir}/01_revenue_margin_analysis.png',
+                                    self._summary['Gross Margin % (Current)'],
+                                    self._summary['Gross Margin % (After Increase)'],
+                                    self._top_clients.head(10))),
+            (_plot_country_performance, (f'{output_dir}/02_country_performance.png',
+                                         self._top_countries)),
+            (_plot_vendor_costs, (f'{output_dir}/03_vendor_costs.png',
+                                  self.data['Vendor Costs'])),
+            (_plot_carrier_analysis, (f'{output_dir}/04_carrier_analysis.png',
+                                      self.data['Carrier Breakdown'])),
+        ]
+        # A pool only pays for its worker startup when there are spare CPUs
+        workers = min(len(tasks), os.cpu_count() or 1)
+        if workers == 1:
+            for task in tasks:
+                _render_chart(task)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_render_chart, tasks))
         
-        bars = axes[1].barh(y_pos, clients['Revenue'], color=colors_clients, alpha=0.8, edgecolor='black')
-        axes[1].set_yticks(y_pos)
-        axes[1].set_yticklabels(clients['Customer'])
-        axes[1].set_xlabel('Revenue ($)', fontweight='bold')
-        axes[1].set_title('Top 10 Clients by Revenue', fontweight='bold', pad=20)
-        axes[1].invert_yaxis()
-        
-        for i, (bar, margin) in enumerate(zip(bars, clients['GM%'])):
-            width = bar.get_width()
-            axes[1].text(width, bar.get_y() + bar.get_height()/2.,
-                        f' ${width:,.0f} ({margin:.0%})',
-                        ha='left', va='center', fontsize=9)
-        
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/01_revenue_margin_analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # 3. Country Performance
-        fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-        
-        countries = self.data['Country Breakdown'].sort_values('Revenue', ascending=False)
-        
-        # Revenue by country
-        colors_country = plt.cm.Set3(np.linspace(0, 1, len(countries)))
-        wedges, texts, autotexts = axes[0].pie(countries['Revenue'], 
-                                                 labels=countries['Country'],
-                                                 autopct='%1.1f%%',
-                                                 colors=colors_country,
-                                                 startangle=90)
-        axes[0].set_title('Revenue Distribution by Country', fontweight='bold', pad=20)
-        
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        # Margin by country
-        y_pos = np.arange(len(countries))
-        margin_colors = ['#FF6B6B' if x < 0.35 else '#4ECDC4' for x in countries['GM%']]
-        
-        bars = axes[1].barh(y_pos, countries['GM%'] * 100, color=margin_colors, alpha=0.8, edgecolor='black')
-        axes[1].set_yticks(y_pos)
-        axes[1].set_yticklabels(countries['Country'])
-        axes[1].set_xlabel('Gross Margin (%)', fontweight='bold')
-        axes[1].set_title('Gross Margin by Country', fontweight='bold', pad=20)
-        axes[1].axvline(x=35, color='red', linestyle='--', linewidth=2, alpha=0.5, label='35% Threshold')
-        axes[1].invert_yaxis()
-        axes[1].legend()
-        
-        for bar in bars:
-            width = bar.get_width()
-            axes[1].text(width + 1, bar.get_y() + bar.get_height()/2.,
-                        f'{width:.1f}%',
-                        ha='left', va='center', fontweight='bold')
+        print(f"\n✓ All visualizations saved to '{output_dir}/' directory")
+    
+    def run_full_analysis(self):
+        """Execute complete analysis pipeline"""
+        sys.stdout.write(f"\n{_HEAVY}\n{_HEAVY_SPACER}\n{_TITLE_LINE}\n{_HEAVY_SPACER}\n{_HEAVY}\n")
         
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/02_country_performance.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        # Run all analyses
+        summary = self.generate_summary_report()
+        top_clients = self.analyze_top_clients()
+        vendors = self.analyze_vendor_efficiency()
+        low_margin_clients, low_margin_countries = self.identify_optimization_opportunities()
+        self.create_visualizations()
         
-        # 4. Vendor Cost Distribution
-        fig, ax = plt.subplots(figsize=(10, 6))
+        results = {
+            'summary': summary,
+            'top_clients': top_clients.to_dict('records'),
+            'vendors': vendors.to_dict('records'),
+            'low_margin_clients': low_margin_clients.to_dict('records'),
+            'low_margin_countries': low_margin_countries.to_dict('records'),
+        }
+        if not self.no_cache:
+            self._export_results(results)
         
-        vendors = self.data['Vendor Costs'].sort_values('Total Cost', ascending=False)
-        colors_vendor = plt.cm.Spectral(np.linspace(0.2, 0.8, len(vendors)))
+        # Final recommendations
+        sys.stdout.write(_RECOMMENDATIONS)
         
+        return results
+
+
+@lru_cache(maxsize=None)
+def _setup_plotting():
+    """Import matplotlib on the Agg backend and apply the report styling"""
+    # Deferred so console-only use of the analyzer never imports matplotlib.
+    # Charts are built on Figure directly and savefig renders through Agg,
+    # so no pyplot backend is selected (the caller's backend is left alone)
+    import matplotlib
+    
+    # Set professional styling (the seaborn darkgrid look; charts set their own colors)
+    matplotlib.rcParams.update({
+        'axes.axisbelow': True,
+        'axes.edgecolor': 'white',
+        'axes.facecolor': '#EAEAF2',
+        'axes.grid': True,
+        'axes.labelcolor': '.15',
+        'axes.linewidth': 0.0,
+        'figure.facecolor': 'white',
+        'font.family': ['sans-serif'],
+        'font.sans-serif': ['Arial', 'Liberation Sans', 'DejaVu Sans', 'Bitstream Vera Sans', 'sans-serif'],
+        'grid.color': 'white',
+        'grid.linestyle': '-',
+        'image.cmap': 'Greys',
+        'legend.frameon': False,
+        'legend.numpoints': 1,
+        'legend.scatterpoints': 1,
+        'lines.solid_capstyle': 'round',
+        'text.color': '.15',
+        'xtick.color': '.15',
+        'xtick.direction': 'out',
+        'xtick.major.size': 0.0,
+        'xtick.minor.size': 0.0,
+        'ytick.color': '.15',
+        'ytick.direction': 'out',
+        'ytick.major.size': 0.0,
+        'ytick.minor.size': 0.0,
+        'figure.figsize': (12, 6),
+        'font.size': 10,
+        'axes.titlesize': 14,
+        'axes.labelsize': 11,
+    })
+
+
+def _render_chart(task):
+    """Run one (plot function, args) task; executed in a worker process"""
+    _setup_plotting()
+    plot, args = task
+    plot(*args)
+
+
+def _plot_revenue_margin(path, current_margin, projected_margin, clients):
+    """Margin scenarios alongside the top 10 clients by revenue"""
+    from matplotlib import cm
+    from matplotlib.figure import Figure
+    
+    # 1. Revenue vs Margin Comparison
+    fig = Figure(figsize=(14, 5), constrained_layout=True)
+    axes = fig.subplots(1, 2)
+    
+    scenarios = ['Current', 'After Price\nIncrease']
+    margins = [current_margin * 100, projected_margin * 100]
+    colors = ['#FF6B6B', '#4ECDC4']
+    
+    bars = axes[0].bar(scenarios, margins, color=colors, alpha=0.8, edgecolor='black')
+    axes[0].axhline(y=45, color='green', linestyle='--', linewidth=2, label='Target: 45%')
+    axes[0].set_ylabel('Gross Margin (%)', fontweight='bold')
+    axes[0].set_title('Gross Margin: Current vs Projected', fontweight='bold', pad=20)
+    axes[0].legend()
+    axes[0].set_ylim(0, 50)
+    
+    axes[0].bar_label(bars, fmt='%.1f%%', fontweight='bold', fontsize=12)
+    
+    # 2. Top 10 Clients by Revenue
+    y_pos = np.arange(len(clients))
+    colors_clients = cm.viridis(np.linspace(0.3, 0.9, len(clients)))
+    
+    bars = axes[1].barh(y_pos, clients['Revenue'], color=colors_clients, alpha=0.8, edgecolor='black')
+    axes[1].set_yticks(y_pos)
+    axes[1].set_yticklabels(clients['Customer'])
+    axes[1].set_xlabel('Revenue ($)', fontweight='bold')
+    axes[1].set_title('Top 10 Clients by Revenue', fontweight='bold', pad=20)
+    axes[1].invert_yaxis()
+    
+    axes[1].bar_label(bars, labels=[f'${w:,.0f} ({m:.0%})' for w, m in zip(clients['Revenue'], clients['GM%'])],
+                      padding=3, fontsize=9)
+    
+    fig.savefig(path, dpi=150)
+
+
+def _plot_country_performance(path, countries):
+    """Revenue share and gross margin by country"""
+    from matplotlib import cm
+    from matplotlib.figure import Figure
+    
+    # 3. Country Performance
+    fig = Figure(figsize=(14, 6), constrained_layout=True)
+    axes = fig.subplots(1, 2)
+    
+    # Revenue by country (bars scale to many countries; pie labels do not)
+    y_pos = np.arange(len(countries))
+    colors_country = cm.Set3(np.linspace(0, 1, len(countries)))
+    shares = countries['Revenue'] / countries['Revenue'].sum()
+    
+    bars = axes[0].barh(y_pos, countries['Revenue'], color=colors_country, alpha=0.8, edgecolor='black')
+    axes[0].set_yticks(y_pos)
+    axes[0].set_yticklabels(countries['Country'])
+    axes[0].set_xlabel('Revenue ($)', fontweight='bold')
+    axes[0].set_title('Revenue Distribution by Country', fontweight='bold', pad=20)
+    axes[0].invert_yaxis()
+    
+    axes[0].bar_label(bars, labels=[f'${w:,.0f} ({p:.1%})' for w, p in zip(countries['Revenue'], shares)],
+                      padding=3, fontsize=9)
+    
+    # Margin by country
+    margin_colors = np.where(countries['GM%'].to_numpy() < 0.35, '#FF6B6B', '#4ECDC4')
+    
+    bars = axes[1].barh(y_pos, countries['GM%'] * 100, color=margin_colors, alpha=0.8, edgecolor='black')
+    axes[1].set_yticks(y_pos)
+    axes[1].set_yticklabels(countries['Country'])
+    axes[1].set_xlabel('Gross Margin (%)', fontweight='bold')
+    axes[1].set_title('Gross Margin by Country', fontweight='bold', pad=20)
+    axes[1].axvline(x=35, color='red', linestyle='--', linewidth=2, alpha=0.5, label='35% Threshold')
+    axes[1].invert_yaxis()
+    axes[1].legend()
+    
+    axes[1].bar_label(bars, fmt='%.1f%%', padding=5, fontweight='bold')
+    
+    fig.savefig(path, dpi=150)
+
+
+def _plot_vendor_costs(path, vendor_costs):
+    """Vendor share of total cost"""
+    from matplotlib import cm
+    from matplotlib.figure import Figure
+    
+    # 4. Vendor Cost Distribution
+    fig = Figure(figsize=(10, 6), constrained_layout=True)
+    ax = fig.subplots()
+    
+    vendors = vendor_costs.sort_values('Total Cost', ascending=False)
+    colors_vendor = cm.Spectral(np.linspace(0.2, 0.8, len(vendors)))
+    
+    if len(vendors) <= MAX_PIE_SLICES:
         wedges, texts, autotexts = ax.pie(vendors['Total Cost'], 
                                             labels=vendors['Vendor'],
                                             autopct=lambda pct: f'${pct*sum(vendors["Total Cost"])/100:,.0f}\n({pct:.1f}%)',
@@ -225,101 +458,69 @@ class AVOXIBillingAnalyzer:
                                             startangle=45,
                                             textprops={'fontsize': 10})
         
-        ax.set_title('Vendor Cost Distribution', fontweight='bold', fontsize=14, pad=20)
-        
         for autotext in autotexts:
             autotext.set_color('white')
             autotext.set_fontweight('bold')
-        
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/03_vendor_costs.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # 5. Carrier Performance
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-        
-        carriers = self.data['Carrier Breakdown'].sort_values('Revenue', ascending=False)
-        
-        x = np.arange(len(carriers))
-        width = 0.35
-        
-        bars1 = axes[0].bar(x - width/2, carriers['Revenue'], width, 
-                           label='Revenue', color='#4ECDC4', alpha=0.8, edgecolor='black')
-        bars2 = axes[0].bar(x + width/2, carriers['Cost'], width, 
-                           label='Cost', color='#FF6B6B', alpha=0.8, edgecolor='black')
-        
-        axes[0].set_xlabel('Carrier Type', fontweight='bold')
-        axes[0].set_ylabel('Amount ($)', fontweight='bold')
-        axes[0].set_title('Revenue vs Cost by Carrier Type', fontweight='bold', pad=20)
-        axes[0].set_xticks(x)
-        axes[0].set_xticklabels(carriers['Number Type'])
-        axes[0].legend()
-        
-        # Add value labels
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                axes[0].text(bar.get_x() + bar.get_width()/2., height,
-                           f'${height:,.0f}',
-                           ha='center', va='bottom', fontsize=9)
-        
-        # Margin by carrier
-        colors_margin = ['#4ECDC4' if x > 0.35 else '#FF6B6B' for x in carriers['GM%']]
-        bars = axes[1].bar(carriers['Number Type'], carriers['GM%'] * 100, 
-                          color=colors_margin, alpha=0.8, edgecolor='black')
-        axes[1].set_ylabel('Gross Margin (%)', fontweight='bold')
-        axes[1].set_title('Margin by Carrier Type', fontweight='bold', pad=20)
-        axes[1].axhline(y=35, color='red', linestyle='--', linewidth=2, alpha=0.5, label='35% Threshold')
-        axes[1].legend()
-        
-        for bar in bars:
-            height = bar.get_height()
-            axes[1].text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.1f}%',
-                        ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        plt.tight_layout()
-        plt.savefig(f'{output_dir}/04_carrier_analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"\n✓ All visualizations saved to '{output_dir}/' directory")
+    else:
+        # Too many slices to label legibly; same bar layout as the country chart
+        y_pos = np.arange(len(vendors))
+        shares = vendors['Total Cost'] / vendors['Total Cost'].sum()
+        
+        bars = ax.barh(y_pos, vendors['Total Cost'], color=colors_vendor, alpha=0.8, edgecolor='black')
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(vendors['Vendor'])
+        ax.set_xlabel('Total Cost ($)', fontweight='bold')
+        ax.invert_yaxis()
+        
+        ax.bar_label(bars, labels=[f'${w:,.0f} ({p:.1%})' for w, p in zip(vendors['Total Cost'], shares)],
+                     padding=3, fontsize=9)
     
-    def run_full_analysis(self):
-        """Execute complete analysis pipeline"""
-        print("\n" + "█"*60)
-        print("██" + " "*56 + "██")
-        print("██" + "  AVOXI BILLING ANALYSIS - COMPREHENSIVE REPORT  ".center(56) + "██")
-        print("██" + " "*56 + "██")
-        print("█"*60)
-        
-        # Run all analyses
-        self.generate_summary_report()
-        self.analyze_top_clients()
-        self.analyze_vendor_efficiency()
-        self.identify_optimization_opportunities()
-        self.create_visualizations()
-        
-        # Final recommendations
-        print(f"\n{'='*60}")
-        print("KEY RECOMMENDATIONS")
-        print("="*60)
-        print("\n1. ✓ Implement pricing increase: Mobile +7%, Landline +20%")
-        print("   → Achieves 46.37% margin (exceeds 45% target)")
-        
-        print("\n2. ✓ Optimize routing for short-duration calls")
-        print("   → Route to per-second vendors (Vendor 2) when possible")
-        
-        print("\n3. ✓ Review pricing for low-margin segments:")
-        print("   → Countries: United States, Chile, Australia")
-        print("   → Clients: Review those below 35% margin threshold")
-        
-        print("\n4. ✓ Monitor vendor concentration")
-        print("   → Top 2 vendors account for ~74% of costs")
-        print("   → Consider diversification strategy")
-        
-        print(f"\n{'='*60}")
-        print("Analysis completed successfully!")
-        print("="*60 + "\n")
+    ax.set_title('Vendor Cost Distribution', fontweight='bold', fontsize=14, pad=20)
+    
+    fig.savefig(path, dpi=150)
+
+
+def _plot_carrier_analysis(path, carrier_breakdown):
+    """Revenue, cost and margin by carrier type"""
+    from matplotlib.figure import Figure
+    
+    # 5. Carrier Performance
+    fig = Figure(figsize=(14, 5), constrained_layout=True)
+    axes = fig.subplots(1, 2)
+    
+    carriers = carrier_breakdown.sort_values('Revenue', ascending=False)
+    
+    x = np.arange(len(carriers))
+    width = 0.35
+    
+    bars1 = axes[0].bar(x - width/2, carriers['Revenue'], width, 
+                       label='Revenue', color='#4ECDC4', alpha=0.8, edgecolor='black')
+    bars2 = axes[0].bar(x + width/2, carriers['Cost'], width, 
+                       label='Cost', color='#FF6B6B', alpha=0.8, edgecolor='black')
+    
+    axes[0].set_xlabel('Carrier Type', fontweight='bold')
+    axes[0].set_ylabel('Amount ($)', fontweight='bold')
+    axes[0].set_title('Revenue vs Cost by Carrier Type', fontweight='bold', pad=20)
+    axes[0].set_xticks(x)
+    axes[0].set_xticklabels(carriers['Number Type'])
+    axes[0].legend()
+    
+    # Add value labels
+    for bars in [bars1, bars2]:
+        axes[0].bar_label(bars, labels=[f'${h:,.0f}' for h in bars.datavalues], fontsize=9)
+    
+    # Margin by carrier
+    colors_margin = np.where(carriers['GM%'].to_numpy() > 0.35, '#4ECDC4', '#FF6B6B')
+    bars = axes[1].bar(carriers['Number Type'], carriers['GM%'] * 100, 
+                      color=colors_margin, alpha=0.8, edgecolor='black')
+    axes[1].set_ylabel('Gross Margin (%)', fontweight='bold')
+    axes[1].set_title('Margin by Carrier Type', fontweight='bold', pad=20)
+    axes[1].axhline(y=35, color='red', linestyle='--', linewidth=2, alpha=0.5, label='35% Threshold')
+    axes[1].legend()
+    
+    axes[1].bar_label(bars, fmt='%.1f%%', fontweight='bold', fontsize=11)
+    
+    fig.savefig(path, dpi=150)
 
 
 def main():